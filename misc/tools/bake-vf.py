@@ -19,34 +19,54 @@ How to debug/develop this script:
       python misc/tools/bake-vf.py "$a" -o build/bake/"$(basename "${a/.Inter/Inter}")"
     done && ttx -t STAT -i -f -s build/bake/Inter-*.ttf )
 
-"""
-import sys, os, os.path, re, argparse
-from fontTools.ttLib import TTFont
-from fontTools.otlLib.builder import buildStatTable
+  Multiple fonts can be baked in parallel by a single process. In that case
+  -o names a directory and output files keep the names of the input files,
+  including any leading dot:
 
+    python misc/tools/bake-vf.py -o build/bake build/fonts/var/.Inter-*.var.ttf &&
+    ttx -t STAT -i -f -s build/bake/.Inter-*.ttf
 
-# stat_axes_format_2 is used for making a STAT table with format 1 & 2 records
+"""
+import sys, os, os.path, argparse
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from fontTools.ttLib import TTFont, getTableClass
+from fontTools.ttLib.sfnt import SFNTWriter
+from fontTools.ttLib.tables._n_a_m_e import makeName
+from fontTools.ttLib.ttFont import sortedTagList
+from fontTools.otlLib.builder import buildStatTable, \
+  AXIS_VALUE_NEGATIVE_INFINITY, AXIS_VALUE_POSITIVE_INFINITY
+
+
+# axes for stat_axes_format_2 which do not depend on the font
+_OPSZ_AXIS = { "name": "Optical Size", "tag": "opsz", "ordering": 0, "values": [
+  dict(nominalValue=14, rangeMinValue=14, rangeMaxValue=21, name="14pt"),
+  dict(nominalValue=28, rangeMinValue=21, rangeMaxValue=28, name="28pt"),
+] }
+_WGHT_AXIS = { "name": "Weight", "tag": "wght", "ordering": 1, "values": [
+  dict(nominalValue=100, rangeMinValue=100, rangeMaxValue=150, name="Thin"),
+  dict(nominalValue=200, rangeMinValue=150, rangeMaxValue=250, name="ExtraLight"),
+  dict(nominalValue=300, rangeMinValue=250, rangeMaxValue=350, name="Light"),
+  dict(nominalValue=400, rangeMinValue=350, rangeMaxValue=450, name="Regular",
+       flags=0x2, linkedValue=660),
+  dict(nominalValue=500, rangeMinValue=450, rangeMaxValue=540, name="Medium"),
+  dict(nominalValue=580, rangeMinValue=540, rangeMaxValue=620, name="SemiBold"),
+  dict(nominalValue=660, rangeMinValue=620, rangeMaxValue=720, name="Bold"),
+  dict(nominalValue=780, rangeMinValue=720, rangeMaxValue=840, name="ExtraBold"),
+  dict(nominalValue=900, rangeMinValue=840, rangeMaxValue=900, name="Black"),
+] }
+_ITAL_VALUE = dict(value=1, name="Italic")
+_ROMAN_VALUE = dict(value=0, name="Roman", flags=0x2, linkedValue=1)
+
+
+# stat_axes_format_2 is used for making a STAT table with format 1 & 2 records.
+# Note: the returned axes share module-level data; callers must not modify them.
 def stat_axes_format_2(is_italic):
   return [
-    { "name": "Optical Size", "tag": "opsz", "ordering": 0, "values": [
-      dict(nominalValue=14, rangeMinValue=14, rangeMaxValue=21, name="14pt"),
-      dict(nominalValue=28, rangeMinValue=21, rangeMaxValue=28, name="28pt"),
-    ] },
-    { "name": "Weight", "tag": "wght", "ordering": 1, "values": [
-      dict(nominalValue=100, rangeMinValue=100, rangeMaxValue=150, name="Thin"),
-      dict(nominalValue=200, rangeMinValue=150, rangeMaxValue=250, name="ExtraLight"),
-      dict(nominalValue=300, rangeMinValue=250, rangeMaxValue=350, name="Light"),
-      dict(nominalValue=400, rangeMinValue=350, rangeMaxValue=450, name="Regular",
-           flags=0x2, linkedValue=660),
-      dict(nominalValue=500, rangeMinValue=450, rangeMaxValue=540, name="Medium"),
-      dict(nominalValue=580, rangeMinValue=540, rangeMaxValue=620, name="SemiBold"),
-      dict(nominalValue=660, rangeMinValue=620, rangeMaxValue=720, name="Bold"),
-      dict(nominalValue=780, rangeMinValue=720, rangeMaxValue=840, name="ExtraBold"),
-      dict(nominalValue=900, rangeMinValue=840, rangeMaxValue=900, name="Black"),
-    ] },
+    _OPSZ_AXIS,
+    _WGHT_AXIS,
     { "name": "Italic", "tag": "ital", "ordering": 2, "values": [
-        dict(value=1, name="Italic") if is_italic else \
-        dict(value=0, name="Roman", flags=0x2, linkedValue=1),
+        _ITAL_VALUE if is_italic else _ROMAN_VALUE,
     ] },
   ]
 
@@ -122,15 +142,13 @@ FAMILY_RELATED_IDS = set([
   VAR_PS_NAME_PREFIX,
 ])
 
-WHITESPACE_RE = re.compile(r'\s+')
-
-
 def remove_whitespace(s):
-  return WHITESPACE_RE.sub('', s)
+  return ''.join(s.split())
 
 
 def normalize_whitespace(s):
-  return WHITESPACE_RE.sub(' ', s)
+  # note: also strips leading and trailing whitespace
+  return ' '.join(s.split())
 
 
 def remove_substring(s, substr):
@@ -139,73 +157,82 @@ def remove_substring(s, substr):
   #   "Display Lol"     => "Lol"
   #   "Foo Display Lol" => "Foo Lol"
   #   " Foo   Bar Lol " => "Foo Bar Lol"
-  return normalize_whitespace(s.strip().replace(substr, '')).strip()
+  return normalize_whitespace(s.replace(substr, ''))
 
 
-def font_is_italic(ttfont):
+def font_is_italic(names):
   """Check if the font has the word "Italic" in its stylename"""
-  stylename = ttfont["name"].getName(2, 3, 1, 0x409).toUnicode()
+  stylename = names[(SUBFAMILY_NAME,) + WINDOWS_ENGLISH_IDS].toUnicode()
   return True if "Italic" in stylename else False
 
 
-def set_full_name(font, fullName, fullNamePs):
-  nameTable = font["name"]
-  nameTable.setName(fullName, FULL_NAME, 1, 0, 0)     # mac
-  nameTable.setName(fullName, FULL_NAME, 3, 1, 0x409) # windows
-  nameTable.setName(fullNamePs, POSTSCRIPT_NAME, 1, 0, 0)     # mac
-  nameTable.setName(fullNamePs, POSTSCRIPT_NAME, 3, 1, 0x409) # windows
+def _index_names(nameTable):
+  # maps (nameID, platformID, platEncID, langID) to name records.
+  # Like nameTable.getName, the first record wins if there are duplicates.
+  names = {}
+  for r in nameTable.names:
+    names.setdefault((r.nameID, r.platformID, r.platEncID, r.langID), r)
+  return names
+
 
+def _set_name(nameTable, names, string, nameID, platformID, platEncID, langID):
+  # like nameTable.setName but uses & updates the names index
+  key = (nameID, platformID, platEncID, langID)
+  rec = names.get(key)
+  if rec is not None:
+    rec.string = string
+  else:
+    nameTable.setName(string, nameID, platformID, platEncID, langID)
+    names[key] = nameTable.names[-1]
 
-def getFamilyName(font):
+
+def set_full_name(font, names, fullName, fullNamePs):
   nameTable = font["name"]
-  r = None
-  for plat_id, enc_id, lang_id in (WINDOWS_ENGLISH_IDS, MAC_ROMAN_IDS):
+  _set_name(nameTable, names, fullName, FULL_NAME, 1, 0, 0)     # mac
+  _set_name(nameTable, names, fullName, FULL_NAME, 3, 1, 0x409) # windows
+  _set_name(nameTable, names, fullNamePs, POSTSCRIPT_NAME, 1, 0, 0)     # mac
+  _set_name(nameTable, names, fullNamePs, POSTSCRIPT_NAME, 3, 1, 0x409) # windows
+
+
+def getFamilyName(names):
+  for ids in (WINDOWS_ENGLISH_IDS, MAC_ROMAN_IDS):
     for name_id in (PREFERRED_FAMILY, LEGACY_FAMILY):
-      r = nameTable.getName(nameID=name_id, platformID=plat_id, platEncID=enc_id, langID=lang_id)
+      r = names.get((name_id,) + ids)
       if r is not None:
-        break
-    if r is not None:
-      break
-  if not r:
-    raise ValueError("family name not found")
-  return r.toUnicode()
+        return r.toUnicode()
+  raise ValueError("family name not found")
 
 
-def getFamilyNames(font):
-  nameTable = font["name"]
-  r = None
-  names = dict()  # dict in Py >=3.7 maintains insertion order
-  for plat_id, enc_id, lang_id in (WINDOWS_ENGLISH_IDS, MAC_ROMAN_IDS):
+def getFamilyNames(names):
+  familyNames = dict()  # dict in Py >=3.7 maintains insertion order
+  for ids in (WINDOWS_ENGLISH_IDS, MAC_ROMAN_IDS):
     for name_id in (PREFERRED_FAMILY, LEGACY_FAMILY):
-      r = nameTable.getName(
-        nameID=name_id, platformID=plat_id, platEncID=enc_id, langID=lang_id)
+      r = names.get((name_id,) + ids)
       if r:
-        names[r.toUnicode()] = True
-  if len(names) == 0:
+        familyNames[r.toUnicode()] = True
+  if len(familyNames) == 0:
     raise ValueError("family name not found")
-  names = list(names.keys())
-  names.sort()
-  names.reverse() # longest first
-  return names
+  familyNames = list(familyNames.keys())
+  familyNames.sort()
+  familyNames.reverse() # longest first
+  return familyNames
 
 
-def getStyleName(font):
-  nameTable = font["name"]
-  for plat_id, enc_id, lang_id in (WINDOWS_ENGLISH_IDS, MAC_ROMAN_IDS):
+def getStyleName(names):
+  for ids in (WINDOWS_ENGLISH_IDS, MAC_ROMAN_IDS):
     for name_id in (TYPO_SUBFAMILY_NAME, SUBFAMILY_NAME):
-      r = nameTable.getName(
-        nameID=name_id, platformID=plat_id, platEncID=enc_id, langID=lang_id)
+      r = names.get((name_id,) + ids)
       if r is not None:
         return r.toUnicode()
   raise ValueError("style name not found")
 
 
-def setStyleName(font, newStyleName):
-  newFullName = getFamilyName(font).strip()
+def setStyleName(font, names, newStyleName):
+  newFullName = getFamilyName(names).strip()
   if newStyleName != 'Regular':
     newFullName += " " + newStyleName
   newFullNamePs = remove_whitespace(newFullName)
-  set_full_name(font, newFullName, newFullNamePs)
+  set_full_name(font, names, newFullName, newFullNamePs)
 
   nameTable = font["name"]
   for rec in nameTable.names:
@@ -214,24 +241,70 @@ def setStyleName(font, newStyleName):
       rec.string = newStyleName
 
 
-def setFamilyName(font, nextFamilyName):
-  prevFamilyNames = getFamilyNames(font)
-  # if prevFamilyNames[0] == nextFamilyName:
-  #   return
-  #   # raise Exception("identical family name")
-
-  def renameRecord(nameRecord, prevFamilyNames, nextFamilyName):
-    # replaces prevFamilyNames with nextFamilyName in nameRecord
-    s = nameRecord.toUnicode()
-    for prevFamilyName in prevFamilyNames:
-      start = s.find(prevFamilyName)
-      if start == -1:
-        continue
-      end = start + len(prevFamilyName)
-      nextFamilyName = s[:start] + nextFamilyName + s[end:]
-      nameRecord.string = nextFamilyName
-      break
-    return s, nextFamilyName
+def _rename_record(nameRecord, s, prevFamilyNames, nextFamilyName):
+  # replaces prevFamilyNames with nextFamilyName in nameRecord, where s is the
+  # decoded string value of nameRecord. The first name in prevFamilyNames that
+  # occurs in s is replaced (at its first occurrence.)
+  for prevFamilyName in prevFamilyNames:
+    start = s.find(prevFamilyName)
+    if start == -1:
+      continue
+    end = start + len(prevFamilyName)
+    nextFamilyName = s[:start] + nextFamilyName + s[end:]
+    nameRecord.string = nextFamilyName
+    break
+  return s, nextFamilyName
+
+
+# The _rename_* functions are called by setFamilyName for name records in
+# FAMILY_RELATED_IDS with the record and its decoded string. "rename" and
+# "psRename" are (prevFamilyNames, nextFamilyName) tuples for regular names and
+# PostScript names, respectively.
+
+def _rename_default(rec, s, rename, psRename):
+  return _rename_record(rec, s, *rename)
+
+
+def _rename_ps(rec, s, rename, psRename):
+  return _rename_record(rec, s, *psRename)
+
+
+def _rename_uid(rec, s, rename, psRename):
+  # The Truetype Unique ID rec may contain either the PostScript Name
+  # or the Full Name
+  psPrevFamilyNames, psNextFamilyName = psRename
+  for prev_psname in psPrevFamilyNames:
+    if prev_psname in s:
+      # Note: This is flawed -- a font called "Foo" renamed to "Bar Lol";
+      # if this record is not a PS record, it will incorrectly be rename "BarLol".
+      # However, in practice this is not a big deal since it's just an ID.
+      return _rename_record(rec, s, [prev_psname], psNextFamilyName)
+  return _rename_record(rec, s, *rename)
+
+
+def _rename_varps(rec, s, rename, psRename):
+  # Variations PostScript Name Prefix.
+  # If present in a variable font, it may be used as the family prefix in the
+  # PostScript Name Generation for Variation Fonts algorithm.
+  # The character set is restricted to ASCII-range uppercase Latin letters,
+  # lowercase Latin letters, and digits.
+  return _rename_record(rec, s, *rename)
+
+
+# name IDs with special handling. Other FAMILY_RELATED_IDS use _rename_default.
+_RENAME_HANDLERS = {
+  POSTSCRIPT_NAME:    _rename_ps,
+  TRUETYPE_UNIQUE_ID: _rename_uid,
+  VAR_PS_NAME_PREFIX: _rename_varps,
+}
+
+
+def setFamilyName(font, names, nextFamilyName, is_italic):
+  prevFamilyNames = getFamilyNames(names)
+  found_VAR_PS_NAME_PREFIX = any(k[0] == VAR_PS_NAME_PREFIX for k in names)
+  if prevFamilyNames == [nextFamilyName] and found_VAR_PS_NAME_PREFIX:
+    # already named nextFamilyName (e.g. font being baked a second time)
+    return
 
   # postcript name can't contain spaces
   psPrevFamilyNames = []
@@ -246,55 +319,111 @@ def setFamilyName(font, nextFamilyName):
       p = s.rfind(' ')
       s = s[:p] + '-' + s[p+1:]
       psPrevFamilyNames.append(s)
+  # remove duplicates (e.g. "Foo Bar" and "FooBar" both yield "FooBar"), keeping order
+  psPrevFamilyNames = tuple(dict.fromkeys(psPrevFamilyNames))
 
   psNextFamilyName = nextFamilyName.replace(" ", "")
-  found_VAR_PS_NAME_PREFIX = False
+  rename = (prevFamilyNames, nextFamilyName)
+  psRename = (psPrevFamilyNames, psNextFamilyName)
   nameTable = font["name"]
 
   for rec in nameTable.names:
     name_id = rec.nameID
-    if name_id not in FAMILY_RELATED_IDS:
+    handler = _RENAME_HANDLERS.get(
+      name_id, _rename_default if name_id in FAMILY_RELATED_IDS else None)
+    if handler is None:
       # leave uninteresting records unmodified
       continue
-    if name_id == POSTSCRIPT_NAME:
-      old, new = renameRecord(rec, psPrevFamilyNames, psNextFamilyName)
-    elif name_id == TRUETYPE_UNIQUE_ID:
-      # The Truetype Unique ID rec may contain either the PostScript Name
-      # or the Full Name
-      prev_psname = None
-      for s in psPrevFamilyNames:
-        if s in rec.toUnicode():
-          prev_psname = s
-          break
-      if prev_psname is not None:
-        # Note: This is flawed -- a font called "Foo" renamed to "Bar Lol";
-        # if this record is not a PS record, it will incorrectly be rename "BarLol".
-        # However, in practice this is not a big deal since it's just an ID.
-        old, new = renameRecord(rec, [prev_psname], psNextFamilyName)
-      else:
-        old, new = renameRecord(rec, prevFamilyNames, nextFamilyName)
-    elif name_id == VAR_PS_NAME_PREFIX:
-      # Variations PostScript Name Prefix.
-      # If present in a variable font, it may be used as the family prefix in the
-      # PostScript Name Generation for Variation Fonts algorithm.
-      # The character set is restricted to ASCII-range uppercase Latin letters,
-      # lowercase Latin letters, and digits.
-      found_VAR_PS_NAME_PREFIX = True
-      old, new = renameRecord(rec, prevFamilyNames, nextFamilyName)
-    else:
-      old, new = renameRecord(rec, prevFamilyNames, nextFamilyName)
+    try:
+      text = rec.toUnicode()
+    except UnicodeDecodeError:
+      # leave records we can't decode unmodified
+      continue
+    old, new = handler(rec, text, rename, psRename)
     # print("  %r: '%s' -> '%s'" % (rec, old, new))
 
   # add name ID 25 "Variations PostScript Name Prefix" if not found
   if not found_VAR_PS_NAME_PREFIX and nextFamilyName.find('Variable') != -1:
     varPSNamePrefix = remove_whitespace(nextFamilyName)
-    if font_is_italic(font):
+    if is_italic:
       varPSNamePrefix += 'Italic'
-    nameTable.setName(varPSNamePrefix, VAR_PS_NAME_PREFIX, 1, 0, 0)     # mac
-    nameTable.setName(varPSNamePrefix, VAR_PS_NAME_PREFIX, 3, 1, 0x409) # windows
-
-
-def gen_stat(ttfont):
+    # we know there are no such records, so add them directly rather than
+    # having setName look for existing ones
+    added = [
+      makeName(varPSNamePrefix, VAR_PS_NAME_PREFIX, 1, 0, 0),     # mac
+      makeName(varPSNamePrefix, VAR_PS_NAME_PREFIX, 3, 1, 0x409), # windows
+    ]
+    for rec in added:
+      names[(rec.nameID, rec.platformID, rec.platEncID, rec.langID)] = rec
+    nameTable.names.extend(added)
+    nameTable.names.sort()
+
+
+def _stat_name_id(ttfont, name, minNameID=0):
+  # returns the ID of the existing name records that buildStatTable would reuse
+  # for name, or None if it would have to add new name records.
+  # buildStatTable (via addMultilingualName) requires both Windows and Mac
+  # English records with the exact string.
+  return ttfont["name"].findMultilingualName(
+    {"en": name}, windows=True, mac=True, minNameID=minNameID, ttFont=ttfont)
+
+
+def _stat_axis_value_key(axisIndex, nameID, v):
+  # returns a comparable key for an axis value dict, as accepted by buildStatTable.
+  # This mirrors how fontTools.otlLib.builder._buildAxisRecords picks the
+  # AxisValue format and fills in defaults.
+  flags = v.get("flags", 0)
+  if "value" in v:
+    if "linkedValue" in v:
+      return (3, axisIndex, flags, nameID, v["value"], v["linkedValue"])
+    return (1, axisIndex, flags, nameID, v["value"])
+  return (2, axisIndex, flags, nameID, v["nominalValue"],
+          v.get("rangeMinValue", AXIS_VALUE_NEGATIVE_INFINITY),
+          v.get("rangeMaxValue", AXIS_VALUE_POSITIVE_INFINITY))
+
+
+def _stat_axis_value_table_key(v):
+  # returns a comparable key for an AxisValue table of a STAT table
+  if v.Format == 1:
+    return (1, v.AxisIndex, v.Flags, v.ValueNameID, v.Value)
+  if v.Format == 2:
+    return (2, v.AxisIndex, v.Flags, v.ValueNameID, v.NominalValue,
+            v.RangeMinValue, v.RangeMaxValue)
+  if v.Format == 3:
+    return (3, v.AxisIndex, v.Flags, v.ValueNameID, v.Value, v.LinkedValue)
+  return (v.Format,)
+
+
+def stat_is_current(ttfont, axes):
+  # returns True if ttfont already has a STAT table identical to what
+  # buildStatTable(ttfont, axes) would produce and buildStatTable would not
+  # need to add any name records, e.g. when re-baking a font
+  if "STAT" not in ttfont:
+    return False
+  stat = ttfont["STAT"].table
+  if stat.Version != 0x00010001 or stat.ElidedFallbackNameID != SUBFAMILY_NAME:
+    return False
+  axisRecords = stat.DesignAxisRecord.Axis if stat.DesignAxisRecord else []
+  axisValues = stat.AxisValueArray.AxisValue if stat.AxisValueArray else []
+  expectAxisRecords = []
+  expectAxisValues = []
+  for i, axis in enumerate(axes):
+    nameID = _stat_name_id(ttfont, axis["name"], 256)
+    if nameID is None:
+      return False
+    expectAxisRecords.append((axis["tag"], nameID, axis.get("ordering", i)))
+    for v in axis.get("values", ()):
+      nameID = _stat_name_id(ttfont, v["name"])
+      if nameID is None:
+        return False
+      expectAxisValues.append(_stat_axis_value_key(i, nameID, v))
+  return (
+    expectAxisRecords == [
+      (a.AxisTag, a.AxisNameID, a.AxisOrdering) for a in axisRecords ] and
+    expectAxisValues == [ _stat_axis_value_table_key(v) for v in axisValues ] )
+
+
+def gen_stat(ttfont, is_italic):
   # builds a STAT table
   # https://learn.microsoft.com/en-us/typography/opentype/spec/stat
   #
@@ -302,16 +431,43 @@ def gen_stat(ttfont):
   # bugs out. See https://github.com/rsms/inter/issues/577
   #
   # build a version 1.1 STAT table with format 2 records:
-  buildStatTable(ttfont, stat_axes_format_2(font_is_italic(ttfont)))
+  axes = stat_axes_format_2(is_italic)
+  if not stat_is_current(ttfont, axes):
+    buildStatTable(ttfont, axes)
   #
   # build a version 1.1 STAT table with format 1 and 3 records:
-  #buildStatTable(ttfont, stat_axes_format_3(font_is_italic(ttfont)))
+  #buildStatTable(ttfont, stat_axes_format_3(is_italic))
   #
   # build a version 1.2 STAT table with format 4 records:
-  #locations = stat_locations(font_is_italic(ttfont))
+  #locations = stat_locations(is_italic)
   #buildStatTable(ttfont, STAT_AXES, locations=locations)
 
 
+def save_font(font, file):
+  # Writes font to file (a writable file object).
+  # Unlike font.save, which writes all tables and then rewrites the whole file
+  # a second time to put the tables in the recommended order, this writes the
+  # tables in their final order in a single pass. Tables that were never loaded
+  # are copied verbatim from the input; only loaded ones (name, STAT) are compiled.
+  # SFNTWriter updates head.checkSumAdjustment when closed.
+  tags = [tag for tag in font.keys() if tag != "GlyphOrder"]
+  tables = {}
+  def compile_table(tag):
+    if tag in tables:
+      return
+    # compile tables which this one depends on first (e.g. glyf before loca)
+    for dep in getTableClass(tag).dependencies:
+      if dep in font:
+        compile_table(dep)
+    tables[tag] = font.getTableData(tag)
+  for tag in tags:
+    compile_table(tag)
+  writer = SFNTWriter(file, len(tags), font.sfntVersion, font.flavor, font.flavorData)
+  for tag in sortedTagList(tags):
+    writer[tag] = tables[tag]
+  writer.close()
+
+
 # def fixup_fvar(ttfont):
 #   fvar = ttfont['fvar']
 #   for a in fvar.axes:
@@ -325,34 +481,28 @@ def gen_stat(ttfont):
 #   os2.usWeightClass = 400
 
 
-def main():
-  argparser = argparse.ArgumentParser(
-    description='Generate STAT table for variable font family')
-  a = lambda *args, **kwargs: argparser.add_argument(*args, **kwargs)
-  a('--family', metavar='<name>',
-    help='Rename family to <name> instead of "Inter Variable"')
-  a('-o', '--output', metavar='<file>',
-    help='Output font file. Defaults to input file (overwrite)')
-  a('input', metavar='<file>', help='Input font file')
-
-  args = argparser.parse_args()
+def bake(infile, outfile, family):
+  # load font.
+  # lazy=True means tables are only decompiled when accessed. We only touch the
+  # name and STAT tables so large ones like glyf, gvar and GPOS are never
+  # decompiled and are copied verbatim when saving.
+  font = TTFont(infile, lazy=True, recalcBBoxes=False, recalcTimestamp=False)
 
-  # load font
-  font = TTFont(args.input, recalcBBoxes=False, recalcTimestamp=False)
+  # index name records once, rather than scanning the name table for every lookup
+  names = _index_names(font["name"])
+  is_italic = font_is_italic(names)
 
   # set family name
-  if not args.family:
-    args.family = "Inter Variable"
-  setFamilyName(font, args.family)
+  setFamilyName(font, names, family, is_italic)
 
   # set style name
-  stylename = remove_substring(getStyleName(font), "Display")
+  stylename = remove_substring(getStyleName(names), "Display")
   if stylename == '':
     stylename = 'Regular'
-  setStyleName(font, stylename)
+  setStyleName(font, names, stylename)
 
   # build STAT table
-  gen_stat(font)
+  gen_stat(font, is_italic)
 
   # # fixup fvar table (set default wght value)
   # fixup_fvar(font)
@@ -360,9 +510,63 @@ def main():
   # # fixup OS/2 table (set usWeightClass)
   # fixup_os2(font)
 
-  # save font
-  outfile = args.output or args.input
-  font.save(outfile)
+  # save font.
+  # Since the font is lazily loaded, its tables may still be read from the input
+  # file while saving. Serialize to memory first so that we can safely overwrite
+  # the input file.
+  buf = BytesIO()
+  save_font(font, buf)
+  font.close()
+  with open(outfile, 'wb') as f:
+    f.write(buf.getvalue())
+
+
+def _bake_one(job):
+  # entry point for worker processes; job is (infile, outfile, family)
+  bake(*job)
+
+
+def main():
+  argparser = argparse.ArgumentParser(
+    description='Generate STAT table for variable font family')
+  a = lambda *args, **kwargs: argparser.add_argument(*args, **kwargs)
+  a('--family', metavar='<name>',
+    help='Rename family to <name> instead of "Inter Variable"')
+  a('-o', '--output', metavar='<file>',
+    help='Output font file, or directory when multiple input files are given. ' +
+         'Defaults to input file (overwrite)')
+  a('-j', '--jobs', metavar='<N>', type=int, default=os.cpu_count() or 1,
+    help='Number of fonts to process in parallel. Defaults to number of CPUs')
+  a('input', metavar='<file>', nargs='+', help='Input font file')
+
+  args = argparser.parse_args()
+
+  if not args.family:
+    args.family = "Inter Variable"
+
+  if len(args.input) == 1:
+    outfiles = [args.output or args.input[0]]
+  elif args.output:
+    if not os.path.isdir(args.output):
+      argparser.error('-o must be a directory when multiple input files are given')
+    outfiles = [os.path.join(args.output, os.path.basename(fn)) for fn in args.input]
+  else:
+    outfiles = args.input
+
+  if len(set(os.path.realpath(fn) for fn in outfiles)) != len(outfiles):
+    argparser.error('multiple input files would be written to the same output file')
+
+  jobs = [(infile, outfile, args.family)
+          for infile, outfile in zip(args.input, outfiles)]
+
+  if len(jobs) == 1 or args.jobs < 2:
+    for job in jobs:
+      _bake_one(job)
+  else:
+    with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as executor:
+      # consume results to propagate any exception raised in a worker
+      for _ in executor.map(_bake_one, jobs):
+        pass
 
 
 if __name__ == '__main__':